@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Regression cases and a differential fuzz for scripts/fixer.py
+
+    python3 scripts/check_fixer.py                  # regression cases
+    python3 scripts/check_fixer.py --fuzz 20000     # plus the fuzz
+
+The fuzz runs fix_any_file against the pre-fusion fix-remaining-nulls.py from
+git history on files glued together from the fragments below. Many of them
+do not end in a newline, so methods, fields and guards share lines. The old
+code checked its 200/300-character lookahead windows against partly
+rewritten content, so both sides get unbounded windows.
+
+Two inputs that are not valid TypeScript are known to differ and are left
+out of the fragments: a bare `tenantId: string;` directly after a method
+brace, and a `user.tenantId: string;` field. The old code only rewrote
+them because of the text its earlier passes had spliced in.
+"""
+
+import argparse
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import types
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, SCRIPTS_DIR)
+
+import fixer  # noqa: E402
+
+# Last revision with the sequential five-strategy fix_any_file
+PRE_FUSION_REV = '506e43f'
+PRE_FUSION_PATH = 'apps/api/fix-remaining-nulls.py'
+
+NULL_CHECK = fixer.NULL_CHECK
+PARAM_CHECK = fixer.PARAM_CHECK
+
+# (name, path the fixer sees, source, expected output)
+CASES = [
+    (
+        'guard line after a field is left alone',
+        'src/communications/entities/a.entity.ts',
+        'async a(@CurrentUser() user: IUser) {\n  }\n  tenantId: string;  if (!user.tenantId) { x(user.tenantId) }',
+        'async a(@CurrentUser() user: IUser) {\n  }\n  tenantId?: string | null;  if (!user.tenantId) { x(user.tenantId) }',
+    ),
+    (
+        'guard inside a multi-line signature still opens a block',
+        'src/api/a.controller.ts',
+        '  async a(\n    if (!user.tenantId) x(user.tenantId),\n    @CurrentUser() user: IUser,\n  ) {\n'
+        '    return user.tenantId;\n  }\n',
+        '  async a(\n    if (!user.tenantId) x(user.tenantId),\n    @CurrentUser() user: IUser,\n  ) {' + NULL_CHECK
+        + '\n    return tenantId;\n  }\n',
+    ),
+    (
+        'existing null check block is kept',
+        'src/api/a.controller.ts',
+        '  async a(@CurrentUser() user: IUser) {\n    if (!user.tenantId) {\n      throw new Error(user.tenantId);\n'
+        '    }\n    const tenantId = user.tenantId; x(user.tenantId);\n    return user.tenantId;\n  }\n',
+        '  async a(@CurrentUser() user: IUser) {\n    if (!user.tenantId) {\n      throw new Error(user.tenantId);\n'
+        '    }\n    const tenantId = user.tenantId; x(user.tenantId);\n    return tenantId;\n  }\n',
+    ),
+    (
+        'logger lines keep user.tenantId',
+        'src/api/a.controller.ts',
+        '  async a(@CurrentUser() user: IUser) {\n    this.logger.log(`a ${user.tenantId}`);\n'
+        '    return this.s.a(user.tenantId);\n  }\n',
+        '  async a(@CurrentUser() user: IUser) {' + NULL_CHECK + '\n    this.logger.log(`a ${user.tenantId}`);\n'
+        '    return this.s.a(tenantId);\n  }\n',
+    ),
+    (
+        'logger test stops at a null check inserted later on the line',
+        'src/api/a.controller.ts',
+        'x(user.tenantId)async a(@CurrentUser() user: IUser) { this.logger.log(user.tenantId) }\n',
+        'x(tenantId)async a(@CurrentUser() user: IUser) {' + NULL_CHECK + ' this.logger.log(user.tenantId) }\n',
+    ),
+    (
+        'function check goes before the method check on a shared brace',
+        'src/database/services/a.service.ts',
+        'async a(@CurrentUser() user: IUser, f = g(tenantId: string): A) {\n  return user.tenantId;\n}\n',
+        'async a(@CurrentUser() user: IUser, f = g(tenantId: string): A) {' + PARAM_CHECK + NULL_CHECK
+        + '\n  return tenantId;\n}\n',
+    ),
+    (
+        'field inside a method signature is rewritten',
+        'src/database/dto/a.dto.ts',
+        '  async a(\n    @CurrentUser() user: IUser,\n    tenantId: string;\n    tenantId!: string;\n  ) {\n  }\n',
+        '  async a(\n    @CurrentUser() user: IUser,\n    tenantId?: string | null;\n    tenantId?: string | null;\n'
+        '  ) {' + NULL_CHECK + '\n  }\n',
+    ),
+    (
+        'bare field needs whitespace before it',
+        'src/database/dto/a.dto.ts',
+        'class A {\n  tenantId: string;\n  parenttenantId: string;\n  tenantId?: string;\n}\n',
+        'class A {\n  tenantId?: string | null;\n  parenttenantId: string;\n  tenantId?: string;\n}\n',
+    ),
+]
+
+FRAGMENTS = [
+    "  @Get()\n  async list(@CurrentUser() user: IUser): Promise<Foo[]> {\n",
+    "  async one(\n    @Param('id') id: string,\n    @CurrentUser() user: IUser,\n  ): Promise<Foo> {\n",
+    "  async b(\n    @CurrentUser() user: IUser,\n  ) {",
+    "async a(@CurrentUser() user: IUser) {",
+    "  async sync(@CurrentUser() user: IUser) { return this.s.x(user.tenantId); }\n",
+    "    this.logger.log(`x ${user.tenantId}`);\n",
+    " this.logger.log(user.tenantId) ",
+    "    return this.svc.list(user.tenantId);\n",
+    "x(user.tenantId)",
+    "    if (!user.tenantId) {\n      throw new Error('x');\n    }\n",
+    "  if (!user.tenantId) { x(user.tenantId) }",
+    "    if (!user.tenantId) { const tenantId = user.tenantId; }\n",
+    "    const tenantId = user.tenantId;\n",
+    "const tenantId = user.tenantId;",
+    "    const tenantId = user.tenantId; this.logger.log(user.tenantId);\n",
+    "  tenantId!: string;\n",
+    "tenantId!: string;",
+    "  tenantId: string;\n",
+    "  tenantId: string;",
+    "  tenantId: string; const x = user.tenantId;\n",
+    "  tenantId?: string | null;\n",
+    "  async find(tenantId: string, id: string): Promise<A> {\n",
+    "  private check(tenantId: string) {\n",
+    "find(tenantId: string) {",
+    "  public list(foo: number, tenantId: string): A[] {\n",
+    "    if (!tenantId) {\n      throw new Error('x');\n    }\n",
+    "  abstract find(tenantId: string): Promise<A>;\n",
+    "  }\n",
+    " }",
+    "\n",
+    "\n  ",
+]
+
+FUZZ_PATHS = [
+    'src/api/x.controller.ts',
+    'src/database/dto/a.dto.ts',
+    'src/communications/entities/a.entity.ts',
+    'src/database/services/a.service.ts',
+    'src/database/repositories/b.repository.ts',
+    'src/x/plain.ts',
+]
+
+
+def run_fix(fix, root, rel_path, source):
+    """Run a fix_any_file on source saved at root/rel_path"""
+    file_path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as f:
+        f.write(source)
+    _, _, log = fix(file_path)
+    with open(file_path) as f:
+        return f.read(), [line for line in log if 'Found' in line]
+
+
+def check_cases(root):
+    failures = 0
+    for name, rel_path, source, expected in CASES:
+        output, _ = run_fix(fixer.fix_any_file, root, rel_path, source)
+        if output == expected:
+            print(f"  ✓ {name}")
+        else:
+            failures += 1
+            print(f"  ✗ {name}")
+            print(f"      expected {expected!r}")
+            print(f"      got      {output!r}")
+    return failures
+
+
+def load_module(name, source):
+    """Build a module from source with unbounded lookahead windows"""
+    module = types.ModuleType(name)
+    exec(compile(re.sub(r'\+ [23]00\]', '+ 10 ** 9]', source), name, 'exec'), module.__dict__)
+    return module
+
+
+def fuzz(root, count, seed, shown=3):
+    old_source = subprocess.run(
+        ['git', 'show', f'{PRE_FUSION_REV}:{PRE_FUSION_PATH}'],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    with open(fixer.__file__) as f:
+        new_source = f.read()
+    old = load_module('pre_fusion', old_source)
+    new = load_module('fused', new_source)
+
+    rng = random.Random(seed)
+    diffs = 0
+    for _ in range(count):
+        source = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12)))
+        rel_path = rng.choice(FUZZ_PATHS)
+        expected = run_fix(old.fix_any_file, os.path.join(root, 'old'), rel_path, source)
+        output = run_fix(new.fix_any_file, os.path.join(root, 'new'), rel_path, source)
+        if output != expected:
+            diffs += 1
+            if diffs <= shown:
+                print(f"  ✗ {rel_path}: {source!r}")
+                print(f"      pre-fusion {expected!r}")
+                print(f"      fused      {output!r}")
+    print(f"  {diffs} of {count} generated files differ from {PRE_FUSION_REV}")
+    return diffs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check scripts/fixer.py')
+    parser.add_argument('--fuzz', type=int, default=0, help='generated files to compare with the pre-fusion fixer')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        print("REGRESSION CASES")
+        failures = check_cases(os.path.join(root, 'cases'))
+        if args.fuzz:
+            print("DIFFERENTIAL FUZZ")
+            failures += fuzz(os.path.join(root, 'fuzz'), args.fuzz, args.seed)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()